@@ -52,12 +52,15 @@ class Parameter(Tensor[T]):
         :param raw_tensor:
         :param device:
         """
-        if not all(isinstance(dim, Dim) for dim in dims):
-            raise TypeError(f"shape {dims} must be a sequence of Dim")
-        if not all(isinstance(dim.dimension, int) for dim in dims):
-            raise ValueError(f"shape {dims} must be static")
-        if len(dims) != len(set((d, d.match_priority) for d in dims)):
-            raise ValueError(f"shape {dims} dims must be unique")
+        dims_set = set()
+        for dim in dims:
+            if not isinstance(dim, Dim):
+                raise TypeError(f"shape {dims} must be a sequence of Dim")
+            if not isinstance(dim.dimension, int):
+                raise ValueError(f"shape {dims} must be static")
+            if (dim, dim.match_priority) in dims_set:
+                raise ValueError(f"shape {dims} dims must be unique")
+            dims_set.add((dim, dim.match_priority))
         super(Parameter, self).__init__(
             "parameter",
             dims=dims,
@@ -80,28 +83,30 @@ class Parameter(Tensor[T]):
     def __copy__(self):
         # Should return new copy. https://github.com/rwth-i6/returnn_common/pull/215#issuecomment-1269651064
         # Note that the values are *not* copied, but rather it will use the same param init scheme.
-        res = type(self)(
-            dims=self.dims,
-            dtype=self.dtype,
-            trainable=self.trainable,
-            auxiliary=self.auxiliary,
-            non_critical_for_restore=self.non_critical_for_restore,
-            weight_decay=self.weight_decay,
-        )
-        res.initial = self.initial
-        return res
+        return self._copy_with_initial(self.initial)
 
     def __deepcopy__(self, memo=None):
         # Should return new copy. https://github.com/rwth-i6/returnn_common/pull/215#issuecomment-1269651064
         # Note that the values are *not* copied, but rather it will use the same param init scheme.
         from copy import deepcopy
 
-        res = self.__copy__()
         if isinstance(self.initial, rf.init.ParamInit):
-            res.initial = deepcopy(self.initial, memo=memo)  # noqa
+            initial = deepcopy(self.initial, memo=memo)  # noqa
         else:
-            res.initial = self.initial
-        return res
+            initial = self.initial
+        return self._copy_with_initial(initial)
+
+    def _copy_with_initial(self, initial: Optional[rf.init.ParamInitType]) -> Parameter[T]:
+        # Pass the initial value directly, so that the backend sets the initial value of the new parameter only once.
+        return type(self)(
+            dims=self.dims,
+            dtype=self.dtype,
+            trainable=self.trainable,
+            auxiliary=self.auxiliary,
+            non_critical_for_restore=self.non_critical_for_restore,
+            weight_decay=self.weight_decay,
+            initial=initial,
+        )
 
     @property
     def initial(self) -> Optional[rf.init.ParamInitType]:
@@ -4,7 +4,7 @@ Provides the :class:`LSTM` module.
 
 from __future__ import annotations
 
-from typing import Tuple, Sequence
+from typing import Union, Tuple, Sequence
 
 import returnn.frontend as rf
 from returnn.tensor import Tensor, Dim, single_step_dim
@@ -138,8 +138,10 @@ class ZoneoutLSTM(LSTM):
         self.parts_order = parts_order.replace("c", "j").replace("g", "j")
         self.dropout_broadcast = rf.dropout_broadcast_default()
         assert len(self.parts_order) == 4 and set(self.parts_order) == set("ijfo")
+        # Indices of the i, j, f, o parts in the split of the 4 * out_dim axis, according to parts_order.
+        self._parts_idx = tuple(self.parts_order.index(c) for c in "ijfo")
 
-    def _inner_step(self, x: Tensor, *, state: LstmState) -> Tuple[Tensor, LstmState]:
+    def _inner_step(self, x: Tensor, *, state: LstmState, train_flag: Union[bool, Tensor]) -> Tuple[Tensor, LstmState]:
         prev_c = state.c
         prev_h = state.h
 
@@ -147,8 +149,7 @@ class ZoneoutLSTM(LSTM):
         rec = rf.dot(prev_h, self.rec_weight, reduce=self.out_dim)
         x = x + rec
         parts = rf.split(x, axis=4 * self.out_dim, out_dims=[self.out_dim] * 4)
-        parts = {k: v for k, v in zip(self.parts_order, parts)}
-        i, j, f, o = parts["i"], parts["j"], parts["f"], parts["o"]
+        i, j, f, o = [parts[idx] for idx in self._parts_idx]
 
         new_c = rf.sigmoid(f + self.forget_bias) * prev_c + rf.sigmoid(i) * rf.tanh(j)
         new_h = rf.sigmoid(o) * rf.tanh(new_c)
@@ -161,6 +162,7 @@ class ZoneoutLSTM(LSTM):
             factor=self.zoneout_factor_cell,
             out_dim=self.out_dim,
             dropout_broadcast=self.dropout_broadcast,
+            train_flag=train_flag,
         )
         h = _zoneout(
             prev=prev_h,
@@ -168,6 +170,7 @@ class ZoneoutLSTM(LSTM):
             factor=self.zoneout_factor_output,
             out_dim=self.out_dim,
             dropout_broadcast=self.dropout_broadcast,
+            train_flag=train_flag,
         )
         new_state = LstmState(c=c, h=h)
 
@@ -197,8 +200,11 @@ class ZoneoutLSTM(LSTM):
         if self.bias is not None:
             x = x + self.bias
 
+        # Get it once here, not in every step.
+        train_flag = rf.get_run_ctx().train_flag
+
         if spatial_dim == single_step_dim:
-            return self._inner_step(x, state=state)
+            return self._inner_step(x, state=state, train_flag=train_flag)
 
         batch_dims = source.remaining_dims((spatial_dim, self.in_dim))
         output, new_state, _ = rf.scan(
@@ -206,16 +212,18 @@ class ZoneoutLSTM(LSTM):
             initial=state,
             xs=x,
             ys=Tensor("lstm-out", dims=batch_dims + [self.out_dim], dtype=source.dtype, feature_dim=self.out_dim),
-            body=lambda x_, s: self._inner_step(x_, state=s),
+            body=lambda x_, s: self._inner_step(x_, state=s, train_flag=train_flag),
         )
         return output, new_state
 
 
-def _zoneout(*, prev: Tensor, cur: Tensor, factor: float, out_dim: Dim, dropout_broadcast: bool) -> Tensor:
+def _zoneout(
+    *, prev: Tensor, cur: Tensor, factor: float, out_dim: Dim, dropout_broadcast: bool, train_flag: Union[bool, Tensor]
+) -> Tensor:
     if factor == 0.0:
         return cur
     return rf.cond(
-        rf.get_run_ctx().train_flag,
+        train_flag,
         lambda: (1 - factor) * rf.dropout(cur - prev, factor, axis=dropout_broadcast and out_dim) + prev,
         lambda: (1 - factor) * cur + factor * prev,
     )
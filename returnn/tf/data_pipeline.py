@@ -120,7 +120,7 @@ import sys
 import typing
 from typing import Optional, Dict
 
-from queue import Queue
+from queue import Queue, Empty
 from threading import Thread, Condition
 
 import numpy
@@ -246,7 +246,7 @@ class FeedDictDataProvider(DataProviderBase):
         :param dataset:
         :param batches:
         :param enforce_min_len1:
-        :param capacity:
+        :param capacity: max number of batches in the queue, prepared in advance by the background thread
         :param batch_slice: select a subset of the batches
         :param extern_data:
         :param data_keys:
@@ -257,12 +257,29 @@ class FeedDictDataProvider(DataProviderBase):
         self.enforce_min_len1 = enforce_min_len1
         self.batch_slice = batch_slice
         self.state_change_cond = Condition()
-        self.queue = None  # type: typing.Optional[Queue]
         self.queue = Queue(maxsize=capacity)
         self.thread = None  # type: typing.Optional[Thread]
         self.thread_finished = False
         self.cur_batch_idx = 0
         self.reached_end = False
+        # Per data key info which stays the same for all batches, such that get_next_batch does not need to recompute it.
+        self._dtype_by_key = {k: self.extern_data.data[k].dtype for k in self.data_keys}  # type: Dict[str,str]
+        self._size_dtype_by_key = {}  # type: Dict[str,str]  # only for data keys with dynamic axis
+        # Data keys which are read from the dataset for each sequence, and whether they have a dynamic axis.
+        self._seq_data_keys = []  # type: typing.List[typing.Tuple[str,bool]]
+        for k in self.data_keys:
+            data_ = self.extern_data.data[k]
+            # Do not rely on time_dim_axis but check for any dynamic axes.
+            dyn_axes = data_.get_dynamic_axes()
+            if dyn_axes:
+                self._size_dtype_by_key[k] = data_.size_dtype
+            # Some special cases, such as "seq_idx" and "seq_tag", will always be added in get_next_batch.
+            # See also :func:`TFNetwork.get_extern_data`.
+            if k in ["seq_idx", "seq_tag"] or self._exclude_data_key(k):
+                continue
+            assert len(dyn_axes) <= 1, f"unexpected dynamic axes in data {k!r} {data_}"
+            self._seq_data_keys.append((k, bool(dyn_axes)))
+        self._feed_placeholders = None  # type: typing.Optional[typing.List[typing.Tuple[tf.Tensor,str]]]
 
     def start_threads(self, session):
         """
@@ -322,38 +339,29 @@ class FeedDictDataProvider(DataProviderBase):
             [batch], data_keys=self.data_keys, extern_data=self.extern_data, enforce_min_len1=self.enforce_min_len1
         )
         data = {
-            k: numpy.zeros(shape=shapes[k], dtype=self.extern_data.data[k].dtype)
+            k: numpy.zeros(shape=shapes[k], dtype=self._dtype_by_key[k])
             for k in self.data_keys
-            if self.extern_data.data[k].dtype != "string"
+            if self._dtype_by_key[k] != "string"
         }
         # Numpy cannot handle "string" dtype. Just make it a list[str], which is what TF can handle.
-        data.update({k: [""] * batch.num_slices for k in self.data_keys if self.extern_data.data[k].dtype == "string"})
+        data.update({k: [""] * batch.num_slices for k in self.data_keys if self._dtype_by_key[k] == "string"})
         data.update({"seq_idx": [-1] * batch.num_slices, "seq_tag": [""] * batch.num_slices})
         seq_lens = {
-            k: numpy.zeros(shape=(shapes[k][0],), dtype=self.extern_data.data[k].size_dtype)
-            for k in self.data_keys
-            if self.extern_data.data[k].get_dynamic_axes()
+            k: numpy.zeros(shape=(shapes[k][0],), dtype=size_dtype) for k, size_dtype in self._size_dtype_by_key.items()
         }
         self.dataset.load_seqs(batch.start_seq, batch.end_seq)
         from returnn.util.basic import slice_pad_zeros
 
-        with self.dataset.lock or contextlib.nullcontext():
-            for seq in batch.seqs:
+        # Only hold the dataset lock per sequence, not for the whole batch,
+        # such that any other thread which adds data to the dataset (e.g. Sprint) is not blocked for too long.
+        dataset_lock = self.dataset.lock or contextlib.nullcontext()
+        for seq in batch.seqs:
+            with dataset_lock:
                 o = seq.batch_frame_offset
                 q = seq.batch_slice
                 length = seq.frame_length
                 # input-data, input-index will also be set in this loop. That is data-key "data".
-                for k in self.data_keys:
-                    # Some special cases first, such as "seq_idx" and "seq_tag".
-                    # See also :func:`TFNetwork.get_extern_data`.
-                    if k in ["seq_idx", "seq_tag"]:
-                        continue  # handled below. will always be added
-                    if self._exclude_data_key(k):
-                        continue
-                    data_ = self.extern_data.data[k]
-                    # Do not rely on time_dim_axis but check for any dynamic axes.
-                    dyn_axes = data_.get_dynamic_axes()
-                    assert len(dyn_axes) <= 1, f"unexpected dynamic axes in data {k!r} {data_}"
+                for k, dyn_axes in self._seq_data_keys:
                     if dyn_axes:
                         if length.get(k) in [0, None]:
                             continue
@@ -394,8 +402,10 @@ class FeedDictDataProvider(DataProviderBase):
                 enqueue_args = self.get_next_batch(consider_batch_slice=True)
                 if enqueue_args is not None:
                     self.queue.put(enqueue_args)
-                with self.state_change_cond:
-                    self.state_change_cond.notifyAll()
+                    # The consumer only waits when the queue was empty, so this is the only state change for it.
+                    # There is only a single consumer (see have_more_data), so waking up one waiter is enough.
+                    with self.state_change_cond:
+                        self.state_change_cond.notify()
                 self.batches.advance(1)
 
             self.reached_end = not self.batches.has_more()
@@ -407,7 +417,7 @@ class FeedDictDataProvider(DataProviderBase):
         finally:
             with self.state_change_cond:
                 self.thread_finished = True
-                self.state_change_cond.notifyAll()
+                self.state_change_cond.notify()
 
     def have_more_data(self, session):
         """
@@ -420,11 +430,11 @@ class FeedDictDataProvider(DataProviderBase):
         with self.state_change_cond:
             while True:
                 # First check if there is still data in the queue to be processed.
-                if self.queue and not self.queue.empty():
+                if not self.queue.empty():
                     return True
                 if self.thread_finished:
                     return False
-                if not self.thread.is_alive:
+                if not self.thread.is_alive():
                     return False
                 # The thread is alive and working. Wait for a change.
                 self.state_change_cond.wait()
@@ -435,10 +445,13 @@ class FeedDictDataProvider(DataProviderBase):
         The data provider thread (self.thread_main()) could currently block in the queue put if it was full.
         """
         while self.have_more_data(None):
-            if self.queue:
-                self.queue.get()
-            else:
-                raise NotImplementedError
+            # Drain everything which is in the queue right now, without going through the condition for every item.
+            # The thread checks coord.should_stop() after each put, so it will finish soon.
+            while True:
+                try:
+                    self.queue.get_nowait()
+                except Empty:
+                    break
 
     def get_feed_dict(self, single_threaded=False):
         """
@@ -459,21 +472,7 @@ class FeedDictDataProvider(DataProviderBase):
         else:
             output = self.queue.get()
         assert isinstance(output, dict)
-        # The data itself.
-        d = {self.extern_data.data[k].placeholder: output[k] for k in self.data_keys if not self._exclude_data_key(k)}
-        # And seq lengths info.
-        for k in self.data_keys:
-            if self._exclude_data_key(k):
-                continue
-            data = self.extern_data.data[k]
-            for dim, len_placeholder in data.size_placeholder.items():
-                if dim == 0:  # time-dim
-                    d[len_placeholder] = output["%s_seq_lens" % k]
-                else:
-                    raise Exception(
-                        "dataset currently does not support variable shape in other dimensions than the first. "
-                        "dim=%i, placeholder=%r" % (dim, len_placeholder)
-                    )
+        d = {placeholder: output[k] for placeholder, k in self._get_feed_placeholders()}
         assert isinstance(self.extern_data, ExternData)
         batch_info = self.extern_data.get_batch_info()
         batch_dim = batch_info.dim
@@ -488,6 +487,31 @@ class FeedDictDataProvider(DataProviderBase):
             d[batch_dim] = output["batch_dim"]
         return d, {"seq_idx": output["seq_idx"], "seq_tag": output["seq_tag"]}
 
+    def _get_feed_placeholders(self) -> typing.List[typing.Tuple[tf.Tensor, str]]:
+        """
+        :return: list of (placeholder, batch-data-value-dict key), for the data itself and the seq lengths.
+          This is computed once on first usage, and then reused for every batch.
+        """
+        if self._feed_placeholders is not None:
+            return self._feed_placeholders
+        # The data itself.
+        res = [(self.extern_data.data[k].placeholder, k) for k in self.data_keys if not self._exclude_data_key(k)]
+        # And seq lengths info.
+        for k in self.data_keys:
+            if self._exclude_data_key(k):
+                continue
+            data = self.extern_data.data[k]
+            for dim, len_placeholder in data.size_placeholder.items():
+                if dim == 0:  # time-dim
+                    res.append((len_placeholder, "%s_seq_lens" % k))
+                else:
+                    raise Exception(
+                        "dataset currently does not support variable shape in other dimensions than the first. "
+                        "dim=%i, placeholder=%r" % (dim, len_placeholder)
+                    )
+        self._feed_placeholders = res
+        return res
+
     def get_dataset_name(self):
         """
         :rtype: str
@@ -568,6 +592,13 @@ class InputContext(object):
         assert not kwargs
         import os
 
+        # data key -> list of (axis_wo_b, size key), for all dynamic axes. Computed once, also used in the generator.
+        size_keys = {}  # type: typing.Dict[str,typing.List[typing.Tuple[int,str]]]
+        for key, data in self.extern_data.data.items():
+            size_keys[key] = [
+                (axis_wo_b, "size:%s:%i" % (key, axis_wo_b)) for axis_wo_b, dim in enumerate(data.shape) if dim is None
+            ]
+
         def generator():
             """
             :rtype: dict[str,numpy.ndarray]
@@ -583,13 +614,10 @@ class InputContext(object):
 
                 res = {}  # type: typing.Dict[str,numpy.ndarray]
                 for key_ in self.parent.data_keys:
-                    data_ = self.extern_data.data[key_]
                     value = returnn_dataset.get_data(seq_idx, key_)
                     res[key_] = value
-                    for axis_wo_b_, dim_ in enumerate(data_.shape):
-                        if dim_ is None:  # dynamic length -- need size info for it
-                            size_key_ = "size:%s:%i" % (key_, axis_wo_b_)
-                            res[size_key_] = value.shape[axis_wo_b_]
+                    for axis_wo_b_, size_key_ in size_keys[key_]:  # dynamic length -- need size info for it
+                        res[size_key_] = value.shape[axis_wo_b_]
                 yield res
                 seq_idx += 1
 
@@ -600,11 +628,9 @@ class InputContext(object):
         for key, data in self.extern_data.data.items():
             output_types[key] = tf.as_dtype(data.dtype)
             output_shapes[key] = tf.TensorShape(data.shape)  # not batch-shape
-            for axis_wo_b, dim in enumerate(data.shape):
-                if dim is None:  # dynamic length -- need size info for it
-                    size_key = "size:%s:%i" % (key, axis_wo_b)
-                    output_types[size_key] = tf.as_dtype(data.size_dtype)
-                    output_shapes[size_key] = tf.TensorShape([])  # scalar. will get batched later
+            for _, size_key in size_keys[key]:
+                output_types[size_key] = tf.as_dtype(data.size_dtype)
+                output_shapes[size_key] = tf.TensorShape([])  # scalar. will get batched later
 
         return tf.data.Dataset.from_generator(
             generator=generator, output_types=output_types, output_shapes=output_shapes
@@ -867,6 +893,8 @@ class DatasetDataProvider(DataProviderBase):
         """
         dataset = context.get_returnn_dataset()
         dataset = context.padded_batch_dataset(dataset)
+        # Let the generator and the batching run ahead in the background, independent of the device copy.
+        dataset = dataset.prefetch(tf.data.experimental.AUTOTUNE)
         dataset = context.map_producer_to_consumer(dataset)
         dataset = context.prefetch_to_consumer_device(dataset)
         return dataset
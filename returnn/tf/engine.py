@@ -2189,6 +2189,7 @@ class Engine(EngineBase):
                 batches=batches,
                 batch_slice=batch_slice,
                 enforce_min_len1=self.config.is_true("enforce_min_len1", False),
+                capacity=self.config.int("data_provider_capacity", 10),
             )
             return data_provider
 
@@ -136,13 +136,14 @@ class _MyCustomMapDatasetThrowingExceptionAtInit(MapDatasetBase):
 class _MyCustomMapDatasetThrowingExceptionAtItem(MapDatasetBase):
     def __init__(self):
         super().__init__(data_types={"data": {"shape": (None, 3)}})
+        self._data = numpy.zeros((len(self), 5, 3))  # allocated once, items are views into it
 
     def __len__(self):
         return 2
 
     def __getitem__(self, item):
         if item == 0:
-            return {"data": numpy.zeros((5, 3))}
+            return {"data": self._data[item]}
         raise _MyCustomMapDatasetException("test exception at getitem")
 
 
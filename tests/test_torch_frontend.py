@@ -581,6 +581,26 @@ def test_forward_hook():
     assert call_count == 5 and hook_call_count == 2
 
 
+def test_parameter_copy():
+    import copy
+
+    in_dim, out_dim = Dim(3, name="in"), Dim(5, name="out")
+    param = rf.Parameter([in_dim, out_dim], weight_decay=0.1)
+    param.initial = 1.5
+
+    param_copy = copy.copy(param)
+    assert param_copy is not param and param_copy.raw_tensor is not param.raw_tensor
+    assert param_copy.dims == param.dims and param_copy.weight_decay == 0.1
+    assert param_copy.initial == 1.5
+    numpy.testing.assert_equal(param_copy.raw_tensor.detach().numpy(), numpy.full((3, 5), 1.5))
+
+    param.initial = rf.init.Glorot()
+    param_deepcopy = copy.deepcopy(param)
+    assert param_deepcopy.raw_tensor is not param.raw_tensor
+    assert isinstance(param_deepcopy.initial, rf.init.Glorot) and param_deepcopy.initial is not param.initial
+    assert param_deepcopy.trainable == param.trainable
+
+
 if __name__ == "__main__":
     better_exchook.install()
     if len(sys.argv) <= 1: